@@ -14,6 +14,7 @@
     • Обработчик не передаёт запись дальше по цепочке (терминальная ветка).
 
 Ограничения:
+    • Обработчик не захватывает блокировку на каждую запись — только для однопоточного кода.
     • Извлечение выполняется по первому вхождению `service_text`; если маркер встречается
       несколько раз, учитывается часть строки после первого вхождения.
     • «Vidop» берётся «как есть» до конца сообщения; если нужно обрезать по разделителям
@@ -32,9 +33,11 @@
 
 import logging
 
+from SRC.lockfreehandler import LockFreeHandler
+
 
 # noinspection SpellCheckingInspection
-class AccumulateVidops(logging.Handler):
+class AccumulateVidops(LockFreeHandler):
     """
     Класс-обработчик для накопления уникальных vidop-значений из логов.
 
@@ -58,6 +61,7 @@ class AccumulateVidops(logging.Handler):
         """
         super().__init__()
         self.service_text = service_text
+        self._service_text_len = len(service_text)
         self.accumulate: set[str] = set()
 
     def emit(self, record: logging.LogRecord) -> None:
@@ -68,12 +72,21 @@ class AccumulateVidops(logging.Handler):
         Примечание:
             Запись не передаётся дальше по цепочке обработчиков.
         """
-        message = record.getMessage()
-        if self.service_text and self.service_text in message:
-            # Извлекаем часть строки после service_text
-            _, _, vidop = message.partition(self.service_text)
-            # Добавляем очищенное значение в множество
-            self.accumulate.add(vidop.strip())
+        service_text = self.service_text
+        if not service_text:
+            return
+
+        # Без аргументов getMessage() вернёт сам record.msg — форматирование не нужно
+        msg = record.msg
+        if record.args or not isinstance(msg, str):
+            msg = record.getMessage()
+
+        index = msg.find(service_text)
+        if index < 0:
+            return
+
+        # Добавляем очищенную часть строки после service_text в множество
+        self.accumulate.add(msg[index + self._service_text_len :].strip())
 
     def output_accumulate(self) -> set[str]:
         """Возвращает множество всех накопленных vidop-значений."""
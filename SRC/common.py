@@ -2,16 +2,19 @@
 Общие утилиты для чтения конфигурации, построчного чтения таблиц и денежных расчётов.
 
 Особенности:
-    * ConfigParser создаётся с `interpolation=None` — строки вида `%(...)s`
+    * CFG читается без интерполяции (`SRC.parameters.read_cfg`) — строки вида `%(...)s`
         читаются как есть.
-    * `fill_in_parameters()` заполняет словарь параметров из CFG или дефолтами.
+    * `Parameters` заполняет словарь параметров из CFG или дефолтами.
     * `input_table()` — ленивое чтение csv-файла с маппингом строк на тип `Table(*row)`.
-    * `sum_str()` — надёжные денежные суммы с Decimal и округлением HALF_EVEN.
+    * `sum_str()` — надёжные денежные суммы с Decimal и округлением HALF_EVEN
+        (`to_decimal()`, `round_money()` — её вспомогательные функции для сумм точнее копейки).
+    * `to_kopecks()`/`kopecks_to_str()` — суммы в целых копейках для горячих циклов.
 """
 
-from typing import NamedTuple, TypeVar, Type, Iterator
+from typing import NamedTuple, TypeVar, Type, Iterator, Iterable
 from decimal import Decimal, ROUND_HALF_EVEN, getcontext, InvalidOperation
 from SRC.tune_logger import TuneLogger
+from itertools import starmap
 import csv
 import logging
 from logging import getLogger
@@ -23,6 +26,12 @@ T = TypeVar("T")
 # Точность вычислений decimal
 getcontext().prec = 28
 
+# Шаг округления денежных сумм — копейка
+CENT = Decimal("0.01")
+
+# Размер буфера чтения входных таблиц
+READ_BUFFER_SIZE = 1 << 20
+
 
 # fmt: off
 class PrimarySecondaryCodes(NamedTuple):
@@ -55,15 +64,91 @@ def sum_str(s1: str, s2: str) -> str:
     """
     Суммирует две суммы в строковом представлении и округляет до копеек
     по банковскому правилу ROUND_HALF_EVEN.
+
+    Суммы с точностью до копейки складываются в целых копейках без Decimal;
+    остальные — через Decimal (сначала сложение, затем округление).
     """
-    if not (isinstance(s1, str) and isinstance(s2, str)):
+    kopecks_1 = parse_kopecks(s1)
+    kopecks_2 = parse_kopecks(s2)
+    if kopecks_1 is not None and kopecks_2 is not None:
+        return kopecks_to_str(kopecks_1 + kopecks_2)
+    return round_money(to_decimal(s1) + to_decimal(s2))
+
+
+def to_decimal(s: str) -> Decimal:
+    """
+    Преобразует сумму в строковом представлении в Decimal.
+    При нестроковом или нечисловом значении возбуждает ValueError.
+    """
+    if not isinstance(s, str):
         raise ValueError
     try:
-        s_decimal = Decimal(s1) + Decimal(s2)
+        return Decimal(s)
     except InvalidOperation:
         raise ValueError
 
-    return str(s_decimal.quantize(Decimal("0.01"), rounding=ROUND_HALF_EVEN))
+
+def round_money(value: Decimal) -> str:
+    """Округляет сумму до копеек по правилу ROUND_HALF_EVEN и возвращает строку."""
+    return str(value.quantize(CENT, rounding=ROUND_HALF_EVEN))
+
+
+def parse_kopecks(s: str) -> int | None:
+    """
+    Разбирает сумму с точностью до копейки ('12', '-3.5', '100.00') в целое число копеек
+    без Decimal. Для прочих записей (больше двух знаков после точки, экспонента,
+    нечисловые и нестроковые значения) возвращает None.
+    """
+    if not isinstance(s, str):
+        return None
+    integer, _, fraction = s.strip().partition(".")
+    digits = integer.lstrip("+-")
+    if (
+        len(fraction) <= 2
+        and len(integer) - len(digits) <= 1
+        and digits.isdigit()
+        and (not fraction or fraction.isdigit())
+    ):
+        kopecks = int(digits) * 100 + int(fraction.ljust(2, "0"))
+        return -kopecks if integer[0] == "-" else kopecks
+    return None
+
+
+def to_kopecks(s: str) -> int:
+    """
+    Преобразует сумму в строковом представлении в целое число копеек.
+
+    Суммы с точностью до копейки разбираются `parse_kopecks()`.
+    Прочие записи (больше двух знаков после точки, экспонента) — через Decimal
+    с округлением ROUND_HALF_EVEN. При нечисловом значении возбуждает ValueError.
+    """
+    kopecks = parse_kopecks(s)
+    if kopecks is not None:
+        return kopecks
+
+    try:
+        return int(to_decimal(s).quantize(CENT, rounding=ROUND_HALF_EVEN) * 100)
+    except InvalidOperation:
+        raise ValueError
+
+
+def add_kopecks(kopecks: int, s: str) -> int:
+    """
+    Прибавляет к сумме в копейках сумму в строковом представлении.
+    Результат совпадает с `sum_str()`: суммы точнее копейки складываются через Decimal
+    с последующим округлением ROUND_HALF_EVEN. При нечисловом `s` возбуждает ValueError.
+    """
+    addend = parse_kopecks(s)
+    if addend is not None:
+        return kopecks + addend
+    return to_kopecks(sum_str(kopecks_to_str(kopecks), s))
+
+
+def kopecks_to_str(kopecks: int) -> str:
+    """Представляет целое число копеек строкой с двумя знаками после точки: -1050 → '-10.50'."""
+    rubles, rest = divmod(abs(kopecks), 100)
+    sign = "-" if kopecks < 0 else ""
+    return f"{sign}{rubles}.{rest:02d}"
 
 
 def normalize_tuple_str(tuple_str: tuple | str) -> tuple[str, ...]:
@@ -72,7 +157,19 @@ def normalize_tuple_str(tuple_str: tuple | str) -> tuple[str, ...]:
     :param tuple_str: Данные типа ('s1', ...) или 's1'
     :return: ('s1', ...).
     """
-    return (tuple_str,) if isinstance(tuple_str, str) else tuple(tuple_str)
+    # type() is str вместо isinstance: в таблицах кодов только str и tuple, без подклассов
+    return (tuple_str,) if type(tuple_str) is str else tuple(tuple_str)
+
+
+# Таблица PRIMARY_SECONDARY_PAYCODES с кодами, приведёнными к кортежам строк.
+# Таблица постоянна, поэтому нормализуется один раз при загрузке модуля.
+NORMALIZED_PAYCODES: tuple[PrimarySecondaryCodes, ...] = tuple(
+    PrimarySecondaryCodes(
+        primary=normalize_tuple_str(row.primary),
+        secondary=normalize_tuple_str(row.secondary),
+    )
+    for row in PRIMARY_SECONDARY_PAYCODES
+)
 
 
 def init_logging(parameters) -> TuneLogger:
@@ -86,19 +183,35 @@ def init_logging(parameters) -> TuneLogger:
     return tune_logger
 
 
+def split_csv_lines(lines: Iterable[str]) -> Iterator[list[str]]:
+    """
+    Разбивает строки CSV на поля.
+
+    Выгрузка Галактики не содержит кавычек, поэтому строка режется `str.split(",")`;
+    строки с кавычками разбираются `csv.reader`. Поля в кавычках с переводом строки
+    внутри не поддерживаются.
+    """
+    for line in lines:
+        if '"' in line:
+            yield next(csv.reader((line,)))
+        else:
+            yield line.rstrip("\r\n").split(",")
+
+
 def input_table(file_table: str, Table: Type[T]) -> Iterator[T]:
     """
     Построчно читает CSV (кодировка cp866) и преобразует каждую строку в объект `Table`.
 
     Ожидается, что вызов `Table(*row)` валиден для каждой строки ввода.
+    Строки разбиваются `split_csv_lines()`, объекты строятся внутри `starmap` (на уровне C).
     Исключения `FileNotFoundError`/`PermissionError` пробрасываются
     вызывающему коду.
     """
     try:
-        with open(file_table, "r", newline="", encoding="cp866") as f:
-            reader = csv.reader(f)
-            for row in reader:
-                yield Table(*row)
+        with open(
+            file_table, "r", newline="", encoding="cp866", buffering=READ_BUFFER_SIZE
+        ) as f:
+            yield from starmap(Table, split_csv_lines(f))
     except (FileNotFoundError, PermissionError) as e:
         logger.critical(
             f"Либо неверно указан файл, выгруженный из Галактики, либо он недоступен\n{e}"
@@ -106,6 +219,15 @@ def input_table(file_table: str, Table: Type[T]) -> Iterator[T]:
         raise
 
 
+def is_logged(level_log: int = logging.ERROR) -> bool:
+    """Проверяет, будет ли сообщение уровня `level_log` передано в журнал через `error()`."""
+    return logger.isEnabledFor(level_log)
+
+
 def error(tabn: str, text_error: str, level_log: int = logging.ERROR) -> None:
-    """Записать ошибку/сообщение в лог общим форматом."""
-    logger.log(level_log, f"Табельный номер {tabn} - {text_error}")
+    """
+    Записать ошибку/сообщение в лог общим форматом.
+    Сообщение собирается только если уровень `level_log` включён.
+    """
+    if logger.isEnabledFor(level_log):
+        logger.log(level_log, f"Табельный номер {tabn} - {text_error}")
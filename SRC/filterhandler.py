@@ -13,6 +13,7 @@
 Особенности:
     • Уровень и формат берутся у целевого обработчика.
     • Если сообщение содержит `service_text`, запись отбрасывается.
+    • Собственная блокировка на запись не захватывается (`LockFreeHandler`).
 
 Пример использования:
     >>> import logging
@@ -36,8 +37,10 @@
 import logging
 import sys
 
+from SRC.lockfreehandler import LockFreeHandler
 
-class FilteringHandler(logging.Handler):
+
+class FilteringHandler(LockFreeHandler):
     """
     Фильтрует сообщения по ключевому тексту перед передачей в `target`.
 
@@ -58,6 +61,7 @@ class FilteringHandler(logging.Handler):
         super().__init__()
         self.target = target
         self.service_text = service_text
+        self._target_handle = target.handle
 
         # Синхронизируем уровень и формат с целевым обработчиком
         self.setLevel(target.level)
@@ -72,15 +76,39 @@ class FilteringHandler(logging.Handler):
             record (logging.LogRecord): Лог-запись, сформированная логгером.
         """
         # Проверяем, содержит ли сообщение служебный текст
-        if not self.service_text or self.service_text not in record.getMessage():
+        if not self._is_service(record):
             try:
                 # Передаём запись дальше по цепочке
-                self.target.handle(record)
+                self._target_handle(record)
             except (FileNotFoundError, PermissionError) as e:
-                # В случае ошибок доступа к файлу — выводим понятное сообщение
-                print(
-                    f"Ошибка доступа к файлу журнала логирования "
-                    f"\n(возможно, неверно указан путь или нет прав):"
-                    f"\n{e}",
-                    file=sys.stderr,
-                )
+                self._report_access_error(e)
+
+    def flush(self) -> None:
+        """Сбрасывает буферизованные записи целевого обработчика."""
+        try:
+            self.target.flush()
+        except (FileNotFoundError, PermissionError) as e:
+            self._report_access_error(e)
+
+    @staticmethod
+    def _report_access_error(e: OSError) -> None:
+        """В случае ошибок доступа к файлу — выводит понятное сообщение."""
+        print(
+            f"Ошибка доступа к файлу журнала логирования "
+            f"\n(возможно, неверно указан путь или нет прав):"
+            f"\n{e}",
+            file=sys.stderr,
+        )
+
+    def _is_service(self, record: logging.LogRecord) -> bool:
+        """
+        Проверяет наличие `service_text` в сообщении.
+        Форматирование `record.getMessage()` выполняется только при наличии `record.args`.
+        """
+        service_text = self.service_text
+        if not service_text:
+            return False
+        msg = record.msg
+        if record.args or not isinstance(msg, str):
+            return service_text in record.getMessage()
+        return service_text in msg
@@ -0,0 +1,34 @@
+"""
+Модуль lockfreehandler
+----------------------
+Автор: Л. А. Большаков, 2025
+
+Назначение:
+    LockFreeHandler — базовый обработчик logging, который вызывает emit() без захвата
+    собственной блокировки. Общая основа для FilteringHandler и AccumulateVidops.
+
+Ограничения:
+    • Только для однопоточного кода (CLI-утилиты проекта).
+    • Контракт `logging.Handler.handle()` сохраняется: фильтр может вернуть
+      запись-замену (Python 3.12+), она и передаётся в emit() и возвращается.
+"""
+
+import logging
+
+
+class LockFreeHandler(logging.Handler):
+    """Обработчик, передающий прошедшие фильтры записи в emit() без блокировки."""
+
+    def handle(self, record: logging.LogRecord) -> bool | logging.LogRecord:
+        """
+        Применяет фильтры и передаёт запись в emit() без захвата блокировки.
+
+        Returns:
+            Результат фильтров: ложное значение, True или запись-замену.
+        """
+        rv = self.filter(record) if self.filters else True
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.emit(record)
+        return rv
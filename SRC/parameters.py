@@ -2,7 +2,6 @@ from typing import NamedTuple, Any
 from pathlib import Path
 import logging
 from logging import getLogger
-from configparser import ConfigParser
 
 from SRC.common import error
 
@@ -14,11 +13,49 @@ MSG_CFG_NOT_FOUND = (
 )
 
 
+COMMENT_PREFIXES = ("#", ";")
+
+
 class RequiredParameter(NamedTuple):
     section_name: str
     default_value: str
 
 
+def read_cfg(config_file_path: str | Path) -> dict[str, dict[str, str]]:
+    """
+    Читает CFG (INI-формат) в словарь {секция: {параметр: значение}}.
+
+    Поддерживается подмножество формата, используемое в CFG программы:
+      * имена секций чувствительны к регистру, имена параметров приводятся к нижнему;
+      * разделитель — `=` или `:`; пробелы и отступы вокруг имён и значений отбрасываются;
+      * строки-комментарии начинаются с `#` или `;`; интерполяции нет.
+    Отсутствующий или недоступный файл даёт пустой словарь.
+    """
+    sections: dict[str, dict[str, str]] = {}
+    try:
+        with open(config_file_path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return sections
+
+    options: dict[str, str] | None = None
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(COMMENT_PREFIXES):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            options = sections.setdefault(line[1:-1], {})
+            continue
+        # Разделитель — первый из встретившихся `=` или `:`
+        positions = [pos for pos in (line.find("="), line.find(":")) if pos >= 0]
+        if options is None or not positions:
+            continue
+        pos = min(positions)
+        options[line[:pos].strip().lower()] = line[pos + 1 :].strip()
+
+    return sections
+
+
 class Parameters:
     """
     Класс для:
@@ -32,7 +69,7 @@ class Parameters:
         config_file_path: str,
         required_parameters: dict[str, RequiredParameter],
     ) -> None:
-        self.config = ConfigParser(interpolation=None)
+        self.config: dict[str, dict[str, str]] = {}
         self.parameters = parameters
         self.return_code = 0
         self._fill_in_parameters(config_file_path, required_parameters)
@@ -67,7 +104,7 @@ class Parameters:
             self.return_code = 1
 
         # Читаем содержимое CFG в self.config
-        self.config.read(config_file_path, encoding="utf-8")
+        self.config = read_cfg(cfg_path)
 
         # Переносим значения (или дефолты) в parameters
         for name, req in required_parameters.items():
@@ -77,6 +114,6 @@ class Parameters:
         self, name_parameter: str, section: str, default: str
     ) -> None:
         """Перенос параметров из config в словарь параметров"""
-        # Замена отсутствующих секций/опций выполняется через fallback; всё храним как str.
-        value = self.config.get(section, name_parameter, fallback=default)
+        # Отсутствующие секции/опции заменяются значением по умолчанию; всё храним как str.
+        value = self.config.get(section, {}).get(name_parameter.lower(), default)
         self.parameters[name_parameter] = str(value)
@@ -6,6 +6,7 @@ TuneLogger: сборка и настройка подсистемы логиро
     * Преобразование уровней (строка/число → int).
     * Создание обработчиков: файл, консоль, и `AccumulateVidops` для сбора служебных vidop.
     * Оборачивание файла/консоли в `FilteringHandler` для исключения сообщений с `service_text`.
+    * Буферизация файла через `MemoryHandler`: записи сбрасываются на диск пачками.
 
 Особенности:
     * Формат лога берётся как есть (из параметров), предварительно интерполяция в INI отключена в `Parameters`.
@@ -14,6 +15,7 @@ TuneLogger: сборка и настройка подсистемы логиро
 
 from pathlib import Path
 import logging
+from logging.handlers import MemoryHandler
 from enum import Enum, auto
 import sys
 from typing import Any
@@ -32,10 +34,53 @@ LEVEL_STR_TO_INT = {
     "CRITICAL": logging.CRITICAL,
 }
 
+LOG_BUFFER_CAPACITY = 4096  # число записей, накапливаемых перед записью в файл лога
+
 
 # fmt: on
 
 
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler без сброса потока после каждой записи: строки копятся в буфере файла
+    и уходят на диск блоками — при явном flush() (его вызывает LogBufferHandler после
+    передачи пачки записей) и при закрытии файла.
+    """
+
+    _in_emit = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # StreamHandler.emit вызывает flush() после каждой записи — на время emit отключаем
+        self._in_emit = True
+        try:
+            super().emit(record)
+        finally:
+            self._in_emit = False
+
+    def flush(self) -> None:
+        if not self._in_emit:
+            super().flush()
+
+
+class LogBufferHandler(MemoryHandler):
+    """
+    MemoryHandler, который очищает буфер даже при ошибке записи в target.
+    Иначе недоступный файл лога приводил бы к повторной отправке тех же записей
+    при каждом следующем сбросе. После передачи пачки записей сбрасывает и сам target.
+    """
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self.target:
+                for record in self.buffer:
+                    self.target.handle(record)
+                self.target.flush()
+        finally:
+            self.buffer.clear()
+            self.release()
+
+
 class HandlerLogger(Enum):
     """Перечисление типов обработчиков логов."""
 
@@ -89,10 +134,12 @@ class TuneLogger:
         # Установка уровня логирования
         file_handler.setLevel(self.log_level_file)
         console_handler.setLevel(self.log_level_console)
-        self.accumulate_vidops.setLevel(logging.DEBUG)
+        # Маркеры необработанных видов оплат пишутся уровнем ERROR — записи ниже
+        # отсекаются в Logger.callHandlers и не доходят до emit()
+        self.accumulate_vidops.setLevel(logging.ERROR)
 
         return {
-            HandlerLogger.file: file_handler,
+            HandlerLogger.file: self.create_buffered_handler(file_handler),
             HandlerLogger.console: console_handler,
             HandlerLogger.not_processed_vidops: self.accumulate_vidops,
         }
@@ -101,12 +148,26 @@ class TuneLogger:
         handlers = list(self.handlers_logger.values())
         self.configure_root_handlers(handlers)
 
-    def create_file_handler(self, file_log_path: str) -> logging.FileHandler:
+    def create_file_handler(self, file_log_path: str) -> BufferedFileHandler:
         # Режим "w": файл лога перезаписывается при каждом запуске; encoding без BOM
-        return logging.FileHandler(
+        return BufferedFileHandler(
             filename=Path(file_log_path), mode="w", encoding="utf-8", delay=True
         )
 
+    @staticmethod
+    def create_buffered_handler(target: logging.Handler) -> LogBufferHandler:
+        """
+        Оборачивает обработчик в MemoryHandler: записи копятся до LOG_BUFFER_CAPACITY штук
+        и передаются в target при заполнении буфера, на уровне CRITICAL,
+        при удалении обработчиков из root и при завершении logging.
+        """
+        buffered_handler = LogBufferHandler(
+            capacity=LOG_BUFFER_CAPACITY, flushLevel=logging.CRITICAL, target=target
+        )
+        buffered_handler.setLevel(target.level)
+        buffered_handler.setFormatter(target.formatter)
+        return buffered_handler
+
     def configure_root_handlers(self, handlers: list[logging.Handler]) -> None:
         self._remove_logging()
         root_logger = logging.getLogger()
@@ -127,9 +188,12 @@ class TuneLogger:
 
     @staticmethod
     def _remove_logging() -> None:
-        logger_root = logging.getLogger()
-        for handler in logger_root.handlers.copy():
-            logger_root.removeHandler(handler)
+        handlers = logging.getLogger().handlers
+        for handler in handlers:
+            # Сбрасываем буферизованные записи до отключения обработчика
+            handler.flush()
+        # Отключаем все обработчики разом, без removeHandler (поиска в списке) на каждый
+        handlers.clear()
 
     def get_accumulated_vidops(self) -> set[str]:
         """Возвращает набор (set) накопленных сообщений из AccumulateVidops."""
@@ -4,7 +4,7 @@
 Назначение
 ---------
 Программа корректирует суммы в «основных» видах оплат на основании «вторичных»
-(РКСН) по правилу соответствий `PRIMARY_SECONDARY_PAYCODES` и формирует список SQL-операторов.
+(РКСН) по правилу соответствий `PRIMARY_SECONDARY_PAYCODES` и формирует SQL-операторы.
 
 Вход:
     * CSV-файл `UCHRABVR.txt` (кодировка cp866): поля соответствуют `UchrabvrStructure`.
@@ -18,7 +18,8 @@
 Пайплайн:
     1) Чтение и группировка записей по `clsch`.
     2) Для каждой группы: поиск соответствий вторичных→основных, суммирование.
-    3) Формирование SQL: `UPDATE uchrabvr WHERE nrec=... SET summa:=...;`
+    3) Формирование SQL: `UPDATE uchrabvr WHERE nrec=... SET summa:=...;` — операторы
+       сразу пишутся в поток `sql_out` и не копятся в памяти.
     4) Журнализация неохваченных видов оплат (служебным форматом).
 
 Пример запуска
@@ -27,13 +28,18 @@
 записываются в файл, заданный в настройках (по умолчанию `galaktika.lot`).
 """
 
-from typing import NamedTuple, Iterable
-from collections import defaultdict
+from typing import Iterable, TextIO
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
+import io
 import logging
+import os
 
 import SRC.common as common
 from SRC.common import (
-    PRIMARY_SECONDARY_PAYCODES,
+    NORMALIZED_PAYCODES,
     PrimarySecondaryCodes,
 )
 from SRC.parameters import Parameters, RequiredParameter
@@ -42,11 +48,13 @@ from SRC.parameters import Parameters, RequiredParameter
 # ==== Модели данных ===========================================================
 
 
-class UchrabvrStructure(NamedTuple):
+@dataclass(slots=True)
+class UchrabvrStructure:
     """Строка UCHRABVR из входного файла.
 
     Поля соответствуют колонкам CSV (порядок фиксирован).
     Все значения поступают как строки и интерпретируются логикой ниже.
+    Класс со __slots__ без frozen: экземпляр создаётся быстрее NamedTuple и без __dict__.
     """
 
     # fmt: off
@@ -68,8 +76,9 @@ class UchrabvrStructure(NamedTuple):
 # ==== Константы и тексты ======================================================
 # fmt: off
 SERVICE_TEXT        = "*** | ***"  # маркер служебных сообщений в логе
-ZERO                = "0.00"
 CONFIG_FILE_PATH    = "uchrabvr.cfg"
+UNATTENDED_ENV      = "UCHRABVR_UNATTENDED"  # переменная окружения: запуск без паузы input()
+TRUE_VALUES         = frozenset(("1", "yes", "true", "да"))
 
 REQUIRED_PARAMETERS: dict[str, RequiredParameter] = {
     "level_console"         : RequiredParameter("LOG", "CRITICAL"),
@@ -77,12 +86,27 @@ REQUIRED_PARAMETERS: dict[str, RequiredParameter] = {
     "file_log_path"         : RequiredParameter("FILES", "uchrabvr.log"),
     "input_file_uchrabvr"   : RequiredParameter("FILES", "UCHRABVR.txt"),
     "output_file_path"      : RequiredParameter("FILES", "uchrabvr_update.lot"),
+    "unattended"            : RequiredParameter("RUN", "no"),
     "log_format"            : RequiredParameter(
         "LOG", "%(asctime)s - %(levelname)s - %(module)s - %(message)s"
     ),
 }
 # fmt: on
 
+# Все основные коды оплат: только их строки попадают в индекс поиска основных строк
+PRIMARY_VIDOPS: frozenset[str] = frozenset(
+    code for row in NORMALIZED_PAYCODES for code in row.primary
+)
+
+# Перечень основных кодов по возрастанию для инструкции в service_warning
+PRIMARY_VIDOPS_TEXT = ", ".join(sorted(PRIMARY_VIDOPS, key=int))
+
+# Вторичный код оплаты → кортеж связанных с ним основных кодов
+# (уникальность вторичных кодов проверяется в Uchrabvr._init_validate)
+SECONDARY_TO_PRIMARY: dict[str, tuple[str, ...]] = {
+    secondary: row.primary for row in NORMALIZED_PAYCODES for secondary in row.secondary
+}
+
 TEXT_ERROR = [
     # 0
     "Вид оплаты {vidop}, дата начала {datan}, дата окончания {datok}"
@@ -108,8 +132,18 @@ TEXT_ERROR = [
     "Программа завершена пользователем",
     # 8
     "Указан неверный путь на файл вывода операторов SQL {out_path} или к нему нет доступа.\n{ex}",
+    # 9
+    "Входной файл не упорядочен по CLSCH: строки лицевого счёта {clsch} разнесены по файлу."
+    "\nОсновные виды оплат для его вторичных могут быть найдены не полностью",
 ]
 
+
+@lru_cache(maxsize=4096)
+def unprocessed_vidop_text(service_text: str, vidop: str) -> str:
+    """Текст TEXT_ERROR[4] для кода оплаты; для повторяющихся кодов берётся из кэша."""
+    return TEXT_ERROR[4].format(service_text=service_text, vidop=vidop)
+
+
 WARNING_TEXT = (
     "\n1. Вызовите Систему Галактика"
     "\n2. Проверьте значение 2 настроек: Возвращать налог (Да), контролировать удержание (Нет)"
@@ -153,7 +187,7 @@ class Uchrabvr:
         (0 — успешное выполнение, 1 — были ошибки).
         """
         self.return_code: int = 0
-        self._index_by_key = dict()
+        self._index_by_key: dict[tuple[str, str, str], int | list[int]] = dict()
         self._init_config()
         self._init_validate()
         self._init_state()
@@ -166,20 +200,30 @@ class Uchrabvr:
 
         Атрибуты:
             person_uchrabvr  — список объектов UchrabvrStructure (входные строки для одного сотрудника);
+            person_summa     — суммы `summa` (в копейках) изменённых основных строк: номер строки в
+                               person_uchrabvr → сумма (строки не пересоздаются при обновлении);
+            person_secondary — вторичные строки сотрудника вместе с их основными кодами
+                               (собираются при построении индекса);
             processed_vidops — множество кодов оплат, которые были обработаны;
-            SQL_update_queries — итоговый список SQL-операторов UPDATE.
+            sql_out          — поток, в который по мере формирования пишутся SQL-операторы UPDATE
+                               (по умолчанию в памяти; CLI подменяет его файлом вывода);
+            sql_count        — число записанных SQL-операторов.
         """
         self.person_uchrabvr = []
+        self.person_summa: dict[int, int] = {}
+        self.person_secondary: list[tuple[UchrabvrStructure, tuple[str, ...]]] = []
         self.processed_vidops = set()
-        self.SQL_update_queries = []
+        self.sql_out: TextIO = io.StringIO()
+        self.sql_count = 0
 
     def _init_config(self) -> None:
         """
         Создаёт словарь параметров из конфигурационного файла.
 
         Действия:
-            * создаётся ConfigParser и словарь parameters;
-            * Parameters(config, parameters) читает uchrabvr.cfg и, при необходимости, задаёт значения по умолчанию;
+            * создаётся словарь parameters;
+            * Parameters(parameters, ...) читает uchrabvr.cfg через read_cfg (без ConfigParser)
+              и, при необходимости, задаёт значения по умолчанию;
             * добавляется служебный параметр, используемый при журнализации.
 
         Итог:
@@ -202,28 +246,35 @@ class Uchrabvr:
         # Стартовое предупреждение с перечнем основных действий
         self.service_warning()
 
-        # Создаём поток строк. Сбрасываем суммы в 0.00 на уровне потока
+        # Создаём поток строк. Входная `summa` не используется: суммы основных строк
+        # накапливаются с нуля в person_summa
         file_uchrabvr = self.parameters_dict["input_file_uchrabvr"]
-        all_uchrabvr: Iterable[UchrabvrStructure] = (
-            row._replace(summa=ZERO)
-            for row in common.input_table(file_uchrabvr, UchrabvrStructure)
+        all_uchrabvr: Iterable[UchrabvrStructure] = common.input_table(
+            file_uchrabvr, UchrabvrStructure
         )
 
-        # Основной блок
-        current_clsch = "-1"
-        for uchrabvr in all_uchrabvr:
-            # Смена сотрудника → обработать накопленную группу
-            if uchrabvr.clsch != current_clsch:
-                self.processing_person()
-                current_clsch = uchrabvr.clsch
-                self.person_uchrabvr.clear()
-            self.person_uchrabvr.append(uchrabvr)
-        # Хвост
-        self.processing_person()
+        # Основной блок. Смена сотрудника (clsch) отслеживается groupby.
+        # Строки сотрудника обрабатываются потоком — вход должен быть упорядочен по clsch
+        # (order by CLSCH в uchrabvr_select.lot); нарушение порядка фиксируется в журнале.
+        person_uchrabvr = self.person_uchrabvr
+        processed_clsch: set[str] = set()
+        for clsch, person_rows in groupby(all_uchrabvr, key=attrgetter("clsch")):
+            person_uchrabvr.extend(person_rows)
+            self.check_order(person_uchrabvr[0], processed_clsch)
+            processed_clsch.add(clsch)
+            self.processing_person()
+
+    def check_order(
+        self, uchrabvr: UchrabvrStructure, processed_clsch: set[str]
+    ) -> None:
+        """Фиксирует ошибку, если строки сотрудника уже встречались раньше (вход не упорядочен по clsch)."""
+        if uchrabvr.clsch in processed_clsch:
+            common.error(uchrabvr.tabn, TEXT_ERROR[9].format(clsch=uchrabvr.clsch))
+            self.return_code = 1
 
     # ==== Обработка одной группы (одного сотрудника) ================================
     def processing_person(self) -> None:
-        """Полный конвейер для одного сотрудника."""
+        """Полный конвейер для одного сотрудника; по завершении его данные освобождаются."""
         if not self.person_uchrabvr:
             return
 
@@ -231,49 +282,98 @@ class Uchrabvr:
         self.processing_vidops()
         self.create_SQL_request()
         self.control_processing_completion()
+        self.release_person()
+
+    def release_person(self) -> None:
+        """Освобождает данные обработанного сотрудника (контейнеры переиспользуются)."""
+        self.person_uchrabvr.clear()
+        self.person_summa.clear()
+        self.person_secondary.clear()
+        self._index_by_key.clear()
 
     def create_index_by_key(self) -> None:
-        self._index_by_key = defaultdict(list)
+        """
+        Строит индекс основных строк сотрудника: (vidop, datan, datok) → номер строки.
+        Ключи почти всегда уникальны, поэтому хранится сам номер; список номеров
+        создаётся только при совпадении ключей.
+        Вторичные строки за тот же проход собираются в person_secondary — по ним
+        processing_vidops ищет основные, не просматривая заново все строки сотрудника.
+        Прочие строки никуда не попадают.
+        """
+        index_by_key = self._index_by_key
+        index_by_key.clear()
+        person_secondary = self.person_secondary
+        person_secondary.clear()
+        primary_vidops = PRIMARY_VIDOPS
+        get_primary_vidops = SECONDARY_TO_PRIMARY.get
         for i_row, row in enumerate(self.person_uchrabvr):
-            self._index_by_key[row.vidop, row.datan, row.datok].append(i_row)
+            secondary_primary_vidops = get_primary_vidops(row.vidop)
+            if secondary_primary_vidops is not None:
+                person_secondary.append((row, secondary_primary_vidops))
+            elif row.vidop in primary_vidops:
+                key = row.vidop, row.datan, row.datok
+                found = index_by_key.get(key)
+                if found is None:
+                    index_by_key[key] = i_row
+                elif type(found) is int:
+                    index_by_key[key] = [found, i_row]
+                else:
+                    found.append(i_row)
 
     def processing_vidops(self) -> None:
-        """Для каждой строки ищем вторичные коды и обновляем соответствующий основной."""
+        """Для каждой вторичной строки (в порядке входного файла) обновляем соответствующую основную."""
         self.processed_vidops.clear()
-        for row in self.person_uchrabvr:
-            for variable in PRIMARY_SECONDARY_PAYCODES:
-                if row.vidop in variable.secondary:
-                    self.update_uchrabvr(row, variable.primary)
-                    break
+        update_uchrabvr = self.update_uchrabvr
+        for row, primary_vidops in self.person_secondary:
+            update_uchrabvr(row, primary_vidops)
 
     def create_SQL_request(self) -> None:
-        """Формируем SQL для строк, помеченных к записи (`write_down`)."""
-        for row in self.person_uchrabvr:
-            if row.summa != ZERO:
-                self.SQL_update_queries.append(
-                    f"UPDATE uchrabvr WHERE nrec={row.nrec} SET summa:={row.summa};"
+        """
+        Формируем SQL для изменённых строк с ненулевой суммой и сразу пишем его в `sql_out`.
+        Строки обходятся в порядке входного файла.
+        """
+        person_uchrabvr, person_summa = self.person_uchrabvr, self.person_summa
+        write_SQL = self.write_SQL
+        for num_in_person_uchrabvr in sorted(person_summa):
+            summa = person_summa[num_in_person_uchrabvr]
+            if summa != 0:
+                nrec = person_uchrabvr[num_in_person_uchrabvr].nrec
+                write_SQL(
+                    f"UPDATE uchrabvr WHERE nrec={nrec} SET summa:={common.kopecks_to_str(summa)};"
                 )
 
+    def write_SQL(self, query: str) -> None:
+        """Пишет SQL-оператор в `sql_out`; операторы разделяются переводом строки (без завершающего)."""
+        if self.sql_count:
+            self.sql_out.write("\n")
+        self.sql_out.write(query)
+        self.sql_count += 1
+
     def control_processing_completion(self) -> None:
-        """Заносим в журнал необработанные строки сотрудника (служебный формат)."""
+        """
+        Заносим в журнал необработанные строки сотрудника (служебный формат).
+        Тексты сообщений формируются только для включённых уровней журнала.
+        """
+        log_service = common.is_logged(logging.ERROR)
+        log_warning = common.is_logged(logging.WARNING)
+        processed_vidops = self.processed_vidops
         for uchrabvr in self.person_uchrabvr:
-            if uchrabvr.vidop not in self.processed_vidops:
-                common.error(
-                    "-----",
-                    TEXT_ERROR[4].format(
-                        service_text=SERVICE_TEXT, vidop=uchrabvr.vidop
-                    ),
-                )
-                common.error(
-                    uchrabvr.tabn,
-                    TEXT_ERROR[4].format(service_text="", vidop=uchrabvr.vidop),
-                    logging.WARNING,
-                )
+            if uchrabvr.vidop not in processed_vidops:
+                if log_service:
+                    common.error(
+                        "-----", unprocessed_vidop_text(SERVICE_TEXT, uchrabvr.vidop)
+                    )
+                if log_warning:
+                    common.error(
+                        uchrabvr.tabn,
+                        unprocessed_vidop_text("", uchrabvr.vidop),
+                        logging.WARNING,
+                    )
                 self.return_code = 1
 
     # ==== Внутренняя логика ==================================================
     def update_uchrabvr(
-        self, uchrabvr: UchrabvrStructure, primary_vidops: str | tuple[str, ...]
+        self, uchrabvr: UchrabvrStructure, primary_vidops: tuple[str, ...]
     ) -> None:
         """Найти соответствующий основной код и прибавить `summaval` вторичной строки к `summa` основной.
         Основной код ищется по vidops, взятому из PRIMARY_SECONDARY_PAYCODES, дате начала и дате окончания оплаты.
@@ -306,49 +406,54 @@ class Uchrabvr:
 
     def find_uchrabvr(
         self,
-        primary_vidops: Iterable[str] | str,
+        primary_vidops: tuple[str, ...],
         datan: str,
         datok: str,
     ) -> list[int]:
-        """Найти индексы строк с vidop и совпадающими датами"""
-        # Нормализация primary_vidops
-        primary_vidops = common.normalize_tuple_str(primary_vidops)
-
-        # Основной блок
+        """
+        Найти индексы строк с vidop и совпадающими датами.
+        primary_vidops уже нормализованы в кортеж (SECONDARY_TO_PRIMARY).
+        """
         nums_in_person_uchrabvr: list[int] = []
+        index_get = self._index_by_key.get
         for pv in primary_vidops:
-            nums_in_person_uchrabvr.extend(
-                self._index_by_key.get((pv, datan, datok), [])
-            )
+            found = index_get((pv, datan, datok))
+            if found is None:
+                continue
+            if type(found) is int:
+                nums_in_person_uchrabvr.append(found)
+            else:
+                nums_in_person_uchrabvr.extend(found)
 
         return nums_in_person_uchrabvr
 
     def update_primary_uchrabvr(
         self, num_in_person_uchrabvr: int, secondary_uchrabvr: UchrabvrStructure
     ) -> None:
-        """Прибавить `summaval` вторичной строки к `summa` найденной основной (Decimal через Parameters.sum_str)."""
+        """
+        Прибавить `summaval` вторичной строки к `summa` найденной основной.
+        Суммы хранятся в целых копейках (common.add_kopecks): первое попадание в основную
+        строку — это просто разбор `summaval`, без Decimal.
+        """
         uchrabvr = self.person_uchrabvr[num_in_person_uchrabvr]
         self.add_vidops_to_processed_vidops(uchrabvr.vidop, secondary_uchrabvr.vidop)
 
         # Прибавляем `summaval` вторичной строки к `summa` найденной основной.
+        current_summa = self.person_summa.get(num_in_person_uchrabvr, 0)
         try:
-            summa = common.sum_str(uchrabvr.summa, secondary_uchrabvr.summaval)
+            summa = common.add_kopecks(current_summa, secondary_uchrabvr.summaval)
         except ValueError:
             common.error(
                 secondary_uchrabvr.tabn,
                 TEXT_ERROR[2].format(
                     vidop=uchrabvr.vidop,
-                    summa_1=uchrabvr.summa,
+                    summa_1=common.kopecks_to_str(current_summa),
                     summa_2=secondary_uchrabvr.summaval,
                 ),
             )
             raise
 
-        # noinspection PyProtectedMember
-        updated_uchrabvr = uchrabvr._replace(
-            summa=summa
-        )  # pylint: disable=protected-access
-        self.person_uchrabvr[num_in_person_uchrabvr] = updated_uchrabvr
+        self.person_summa[num_in_person_uchrabvr] = summa
 
     def add_vidops_to_processed_vidops(self, vidop1: str, vidop2: str) -> None:
         """Добавляем vidop в список обработанных vidop"""
@@ -356,10 +461,9 @@ class Uchrabvr:
         self.processed_vidops.add(vidop2)
 
     def prepare_string(
-        self, row: UchrabvrStructure, num_error: int, main_vidop: str | tuple[str, ...]
+        self, row: UchrabvrStructure, num_error: int, main_vidop: tuple[str, ...]
     ) -> str:
         """Собрать сообщение об ошибке по шаблону."""
-        main_vidop = common.normalize_tuple_str(main_vidop)
         return TEXT_ERROR[num_error].format(
             vidop=row.vidop,
             datan=row.datan,
@@ -369,7 +473,7 @@ class Uchrabvr:
 
     def _init_validate(self):
         """Валидация констант и входных данных"""
-        codes = self.validate_unique_secondary_codes(PRIMARY_SECONDARY_PAYCODES)
+        codes = self.validate_unique_secondary_codes(NORMALIZED_PAYCODES)
         if codes:
             common.error("-----", TEXT_ERROR[3].format(codes=codes))
             raise ValueError
@@ -398,23 +502,27 @@ class Uchrabvr:
 
     # ==== Сервис ==============================================
     def output_result(self) -> list[str]:
-        """Вернуть сформированные SQL-запросы."""
-        return self.SQL_update_queries
+        """Вернуть сформированные SQL-запросы (когда `sql_out` — поток в памяти)."""
+        return self.sql_out.getvalue().splitlines()
 
     def service_warning(self) -> None:
         """
-        Печатает пошаговые инструкции; формирует перечень основных vidop;
-        ставит паузу `input()` перед стартом.
+        Печатает пошаговые инструкции с перечнем основных vidop (PRIMARY_VIDOPS_TEXT);
+        ставит паузу `input()` перед стартом, если не задан запуск без участия пользователя.
         """
-        all_vidops_primary: set[int] = set()
-        for row in PRIMARY_SECONDARY_PAYCODES:
-            vidops = (row.primary,) if isinstance(row.primary, str) else row.primary
-            for vidop in vidops:
-                all_vidops_primary.add(int(vidop))
-
-        all_vidops_str_sorted = (str(vidop) for vidop in sorted(all_vidops_primary))
-        logging.critical(WARNING_TEXT.format(vidops=", ".join(all_vidops_str_sorted)))
-        input("Для продолжения работы нажмите клавишу Enter")
+        logging.critical(WARNING_TEXT.format(vidops=PRIMARY_VIDOPS_TEXT))
+        if not self.is_unattended():
+            input("Для продолжения работы нажмите клавишу Enter")
+
+    def is_unattended(self) -> bool:
+        """
+        Запуск без паузы: переменная окружения UCHRABVR_UNATTENDED
+        или параметр [RUN] unattended в uchrabvr.cfg (1/yes/true/да).
+        """
+        value = os.environ.get(UNATTENDED_ENV) or self.parameters_dict.get(
+            "unattended", ""
+        )
+        return value.strip().lower() in TRUE_VALUES
 
     def stop(self) -> None:
         """Завершение работы: вывести неохваченные виды и закрыть логирование."""
@@ -1,5 +1,7 @@
 from __future__ import annotations
+from contextlib import nullcontext
 from pathlib import Path
+from typing import TextIO
 import logging
 import sys
 
@@ -11,37 +13,60 @@ from SRC.common import error
 # чтобы результат совпадал с эталонами byte-в-byte.
 _ENC = "cp866"
 _NEWLINE = "\r\n"
+# Размер буфера файла вывода, байт: SQL-операторы сбрасываются на диск крупными блоками
+_WRITE_BUFFER_SIZE = 1 << 20
 
 
 def run_once() -> int:
     """
     Полный цикл CLI:
       - создать объект
-      - start() / stop()
-      - записать результат в файл (из parameters["output_file_path"])
+      - start() / stop(); SQL-операторы по ходу обработки пишутся во временный файл
+      - при успешной обработке временный файл заменяет файл вывода
+        (из parameters["output_file_path"])
       - вернуть код возврата (0 при успехе)
     Без чтения argv — пути берём из cfg.
     """
     app = Uchrabvr()
+
+    out_path = Path(app.parameters_dict["output_file_path"])
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    sql_file = _open_output(tmp_path, out_path)
+    if sql_file is None:
+        # Обработку выполняем всё равно (ради журнала), операторы остаются в памяти
+        app.return_code = 1
+    else:
+        app.sql_out = sql_file
+
     try:
-        app.start()
+        with sql_file or nullcontext():
+            app.start()
     except KeyboardInterrupt:
+        _discard(tmp_path, sql_file)
         error("-----", TEXT_ERROR[7], logging.CRITICAL)
         raise
     except (FileNotFoundError, PermissionError, ValueError):
+        _discard(tmp_path, sql_file)
         return 1
+    except BaseException:
+        # Прочие ошибки (например, TypeError на строке неверного формата) не
+        # перехватываются, но недописанный временный файл не остаётся на диске
+        _discard(tmp_path, sql_file)
+        raise
 
     app.stop()
 
-    out_path = Path(app.parameters_dict["output_file_path"])
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-
-    try:
-        with open(out_path, "w", encoding=_ENC, newline=_NEWLINE) as f:
-            f.write("\n".join(app.output_result()))
-    except FileNotFoundError, PermissionError:
-        error("-----", TEXT_ERROR[8], logging.CRITICAL)
-        app.return_code = 1
+    if sql_file is not None:
+        try:
+            tmp_path.replace(out_path)
+        except (FileNotFoundError, PermissionError) as ex:
+            _discard(tmp_path, sql_file)
+            error(
+                "-----",
+                TEXT_ERROR[8].format(out_path=out_path, ex=ex),
+                logging.CRITICAL,
+            )
+            app.return_code = 1
 
     if app.return_code:
         error("-----", TEXT_ERROR[6], logging.CRITICAL)
@@ -49,6 +74,30 @@ def run_once() -> int:
     return int(app.return_code)
 
 
+def _open_output(tmp_path: Path, out_path: Path) -> TextIO | None:
+    """Открывает временный файл вывода SQL; при ошибке доступа пишет в журнал и возвращает None."""
+    try:
+        tmp_path.parent.mkdir(parents=True, exist_ok=True)
+        return open(
+            tmp_path,
+            "w",
+            buffering=_WRITE_BUFFER_SIZE,
+            encoding=_ENC,
+            newline=_NEWLINE,
+        )
+    except (FileNotFoundError, PermissionError) as ex:
+        error("-----", TEXT_ERROR[8].format(out_path=out_path, ex=ex), logging.CRITICAL)
+        return None
+
+
+def _discard(tmp_path: Path, sql_file: TextIO | None) -> None:
+    """Удаляет недописанный временный файл вывода SQL."""
+    if sql_file is None:
+        return
+    sql_file.close()
+    tmp_path.unlink(missing_ok=True)
+
+
 def main() -> None:
     """Entry point для `python -m SRC.uchrabvr_cli` или console_script."""
     sys.exit(run_once())
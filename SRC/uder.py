@@ -2,7 +2,7 @@
 Проверка налоговых удержаний по месяцам (Uder).
 
 Назначение:
-    Считывает `UDER.txt`, нормализует коды/месяцы, группирует удержания по сотруднику
+    Считывает `UDER.txt`, нормализует месяцы, группирует удержания по сотруднику
     и проверяет «налоговые» удержания (VIDOPS_OF_TAX): по каждой группе месячных записей
     суммирует значения и ожидает нулевой остаток. Ненулевые суммы фиксирует в логе.
 
@@ -13,21 +13,18 @@
     * настраивается через `Parameters.init_logging()`/`TuneLogger`.
 """
 
-from configparser import ConfigParser
 from typing import Iterable
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+from itertools import groupby
+from operator import attrgetter
 import logging
 
-from SRC.common import (
-    PRIMARY_SECONDARY_PAYCODES,
-    PrimarySecondaryCodes,
-)
 import SRC.common as common
 
 from SRC.parameters import Parameters, RequiredParameter
 
 # fmt: off
-VIDOPS_OF_TAX           = ("13", "182")
+VIDOPS_OF_TAX           = frozenset(("13", "182"))
 CONFIG_FILE_PATH        = "uder.cfg"
 
 REQUIRED_PARAMETERS     : dict[str, RequiredParameter] = {
@@ -40,10 +37,12 @@ REQUIRED_PARAMETERS     : dict[str, RequiredParameter] = {
 }
 
 
-@dataclass(frozen=True, slots=True)
+@dataclass(slots=True)
 class UderStructure:
     """Строка входных данных UDER.txt (одна строка удержания).
 
+    Без frozen: __init__ замороженного dataclass присваивает поля через object.__setattr__
+    и в несколько раз медленнее создаёт строку.
     Поля соответствуют колонкам входного файла:
     """
     nrec                : str # идентификатор записи
@@ -58,21 +57,20 @@ class UderStructure:
 
 # fmt: on
 
-
-@dataclass(frozen=True, slots=True)
-class UderGrouped(UderStructure):
-    """Модификация записи удержания с добавленным ключом группировки по месяцу."""
-
-    group_vidud: str
+# Готовые формы "MM" для типичных значений месяца ('', '7', '07', '12', ...): поиск в словаре
+# вместо среза и rjust на каждой строке. Значения вне словаря нормализуются в normalize_mount.
+MOUNT_TO_MM: dict[str, str] = {
+    mount: mount[:2].rjust(2, "0")
+    for mount in ("", *(str(i) for i in range(13)), *(f"{i:02d}" for i in range(10)))
+}
 
 
 class Uder:
     """Загрузка параметров, настройка логирования, нормализация данных и проверка удержаний по группам."""
 
     def __init__(self) -> None:
-        self.config = ConfigParser()
         self.parameters_dict: dict[str, str] = {}
-        self.person_uders: list[UderStructure] = []
+        self._report_buf: list[str] = []  # строки отчёта по текущему сотруднику
 
         # 1. Загрузка и валидация параметров
         parameters = Parameters(
@@ -93,44 +91,29 @@ class Uder:
         common.init_logging(self.parameters_dict)
 
     def _normalize_data(self) -> None:
-        """Кэширует таблицу соответствий PRIMARY_SECONDARY_PAYCODES в виде кортежей строк."""
+        """Кэширует предельный месяц (last_mount) в формате "MM"."""
         self.normalize_last_mount = self.normalize_mount(
             self.parameters_dict.get("last_mount", "")
         )
-        self.normalized_variable_vidops = tuple(
-            self.normalize_codes(row) for row in PRIMARY_SECONDARY_PAYCODES
-        )
 
     def start(self) -> None:
         """Главный цикл: читает UDER.txt, накапливает удержания по сотруднику и обрабатывает группы."""
         file_uder = self.parameters_dict["input_file_uder"]
-        all_uders: Iterable[UderStructure] = (
-            row for row in common.input_table(file_uder, UderStructure)
+        all_uders: Iterable[UderStructure] = common.input_table(
+            file_uder, UderStructure
         )
 
         logging.error(
             "Заполнитель 1; Табельный номер; Заполнитель 2; Месяц; Заполнитель 3; Разница сумм налогов"
         )
-        current_clsch = None
-        for uder in all_uders:
-            # Смена сотрудника → сначала обработать накопленную группу (если она не пуста).
-            if current_clsch is None:
-                current_clsch = uder.clsch
-
-            if uder.clsch != current_clsch:
-                self.processing_person()
-                self.person_uders.clear()
-                current_clsch = uder.clsch
+        # Смена сотрудника (clsch) отслеживается groupby; записи сотрудника не копятся в списке.
+        for _, person_uders in groupby(all_uders, key=attrgetter("clsch")):
+            self.processing_person(person_uders)
 
-            self.person_uders.append(uder)
-
-        # # Обработать «хвост» — накопленные записи последнего сотрудника.
-        self.processing_person()
-
-    def processing_person(self):
-        """Фильтрует и сортирует записи по группам месяцов и валидирует их суммы."""
-        filtered_uders = self.filter_sort_by_group()
-        self.validate_person_groups(filtered_uders)
+    def processing_person(self, person_uders: Iterable[UderStructure]) -> None:
+        """Суммирует удержания сотрудника по группам месяцев и валидирует суммы групп."""
+        group_sums, group_tabns = self.sum_by_group(person_uders)
+        self.validate_person_groups(group_sums, group_tabns)
 
     def create_group_key(self, uder: UderStructure) -> str | None:
         """
@@ -139,76 +122,71 @@ class Uder:
         за который произведено удержание, не больше предельного месяца,
         то возвращается месяц в формате ММ, иначе None.
         """
+        if uder.vidud not in VIDOPS_OF_TAX:
+            return None
+
+        # Месяцы в формате ММ сравниваются как строки — порядок совпадает с числовым
         normalize_mount = self.normalize_mount(uder.mes)
-        if (
-            uder.vidud not in VIDOPS_OF_TAX
-            or self.normalize_last_mount < normalize_mount
-        ):
+        if self.normalize_last_mount < normalize_mount:
             return None
 
         return normalize_mount
 
-    def normalize_codes(self, codes: PrimarySecondaryCodes) -> PrimarySecondaryCodes:
-        """Нормализует набор кодов: гарантирует, что primary/secondary представлены как кортежи строк."""
-        return PrimarySecondaryCodes(
-            primary=common.normalize_tuple_str(codes.primary),
-            secondary=common.normalize_tuple_str(codes.secondary),
-        )
-
-    def normalize_mount(self, mount: str) -> str:
+    @staticmethod
+    def normalize_mount(mount: str) -> str:
         """
         Приводит строку с номером месяца к формату "MM": '','7','12','11...' → '00','07','12','11'.
         """
-        if len(mount) == 0:
-            return "00"
-        if len(mount) == 1:
-            return ("0" + mount)[0:2]
-        return mount[0:2]
-
-    def filter_sort_by_group(self) -> list[UderGrouped]:
-        """Отбирает удержания, для которых есть ключ группы, и сортирует их по месяцу (group_vidud)."""
-        filtered_uders: list[UderGrouped] = []
-        for uder in self.person_uders:
+        return MOUNT_TO_MM.get(mount) or mount[:2].rjust(2, "0")
+
+    def sum_by_group(
+        self, person_uders: Iterable[UderStructure]
+    ) -> tuple[dict[str, int], dict[str, str]]:
+        """
+        За один проход суммирует удержания сотрудника по ключам групп (месяцам).
+        Удержания без ключа группы пропускаются.
+        :param person_uders: Удержания одного сотрудника
+        :return: (суммы в копейках по месяцам, табельные номера по месяцам)
+        """
+        group_sums: dict[str, int] = {}
+        group_tabns: dict[str, str] = {}
+        for uder in person_uders:
             group_key = self.create_group_key(uder)
-            if group_key is not None:
-                filtered_uders.append(
-                    UderGrouped(**asdict(uder), group_vidud=group_key)
-                )
-
-        filtered_uders.sort(key=lambda row: row.group_vidud)
-        return filtered_uders
-
-    def check_summa(self, summa: str, uder: UderGrouped | None) -> None:
-        """Логирует ненулевую сумму для группы (месяца) конкретного сотрудника."""
-        if uder is None:
-            return
-        if summa != "0.00":
-            mount = uder.group_vidud
-            logging.info(
-                f"Табельный номер; {uder.tabn}; Месяц; {mount}; Разница сумм налогов =; {summa}"
+            if group_key is None:
+                continue
+            # Итог округляется после каждого сложения (как sum_str): от накопленной
+            # суммы зависит округление ROUND_HALF_EVEN для сумм точнее копейки
+            group_sums[group_key] = common.add_kopecks(
+                group_sums.get(group_key, 0), uder.sumud
             )
+            group_tabns[group_key] = uder.tabn
+
+        return group_sums, group_tabns
+
+    def check_summa(self, summa: int, tabn: str, mount: str) -> None:
+        """Заносит в буфер отчёта ненулевую сумму (в копейках) для группы (месяца) конкретного сотрудника."""
+        if summa != 0:
+            self._report_buf.append(
+                f"Табельный номер; {tabn}; Месяц; {mount}; Разница сумм налогов =; "
+                f"{common.kopecks_to_str(summa)}"
+            )
+
+    def flush_report(self) -> None:
+        """Выводит накопленные строки отчёта одной записью лога и очищает буфер."""
+        if self._report_buf:
+            logging.info("\n".join(self._report_buf))
+            self._report_buf.clear()
 
-    def validate_person_groups(self, filtered_uders: list[UderGrouped]) -> None:
-        # noinspection GrazieInspection
+    def validate_person_groups(
+        self, group_sums: dict[str, int], group_tabns: dict[str, str]
+    ) -> None:
         """
         Проверяет удержания по всем группам у одной персоны:
-        суммирует значения в каждой группе и сверяет, что итог равен нулю.
-        Смена ключа → проверка суммы предыдущей группы; в конце дополнительная проверка "хвоста".
+        сверяет, что итог каждой группы равен нулю. Группы обходятся по возрастанию месяца.
         """
-        current_group = None
-        summa = "0.00"
-        for i_uder, uder in enumerate(filtered_uders):
-            if current_group is None:
-                current_group = uder.group_vidud
-
-            if current_group != uder.group_vidud:
-                self.check_summa(summa, filtered_uders[i_uder - 1])
-                summa = "0.00"
-                current_group = uder.group_vidud
-            summa = common.sum_str(summa, uder.sumud)
-
-        if len(filtered_uders) != 0:
-            self.check_summa(summa, filtered_uders[-1])
+        for mount in sorted(group_sums):
+            self.check_summa(group_sums[mount], group_tabns[mount], mount)
+        self.flush_report()
 
 
 if __name__ == "__main__":
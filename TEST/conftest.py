@@ -0,0 +1,6 @@
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]  # C:\2_otpusk
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
@@ -3,9 +3,19 @@ import logging
 from io import StringIO
 from typing import NamedTuple, Any
 from configparser import ConfigParser
-
-from SRC.parameters import RequiredParameter, Parameters
-from SRC.common import error, input_table, sum_str
+from decimal import Decimal
+
+from SRC.parameters import RequiredParameter, Parameters, read_cfg
+from SRC.common import (
+    error,
+    input_table,
+    sum_str,
+    to_decimal,
+    round_money,
+    to_kopecks,
+    kopecks_to_str,
+    add_kopecks,
+)
 
 
 class Rows(NamedTuple):
@@ -52,6 +62,12 @@ def test_input_table(monkeypatch):
     for i, row in enumerate(input_table("Something", Rows)):
         assert row == rows[i]
 
+    rows_string = '11,"1,2",13\r\n21,22,23\r\n'
+    assert list(input_table("Something", Rows)) == [
+        ("11", "1,2", "13"),
+        ("21", "22", "23"),
+    ]
+
     monkeypatch.setattr("builtins.open", mock_file_not_found)
     with pytest.raises(FileNotFoundError):
         list(input_table("Something", Rows))
@@ -124,10 +140,35 @@ def test_fill_inparameters_exists_cfg(caplog, tmp_path):
     }
 
 
+def test_read_cfg(tmp_path):
+    config_file_path = tmp_path / "indented.cfg"
+    config_file_path.write_text(
+        "# комментарий\n"
+        "[LOG]\n"
+        "    Level_Console=CRITICAL\n"
+        "    log_format=%(asctime)s - %(message)s\n"
+        "[FILES]\t\n"
+        "    file_log_path= uder.log \n"
+        "; ещё комментарий\n"
+        "[Limits]\n"
+        "    last_mount: 6\n",
+        encoding="utf-8",
+    )
+
+    assert read_cfg(config_file_path) == {
+        "LOG": {"level_console": "CRITICAL", "log_format": "%(asctime)s - %(message)s"},
+        "FILES": {"file_log_path": "uder.log"},
+        "Limits": {"last_mount": "6"},
+    }
+    assert read_cfg(tmp_path / "no_such_file.cfg") == {}
+
+
 @pytest.mark.parametrize(
     "s1, s2, expected_result",
     [
         ("7", "1", "8.00"),
+        ("-90.5", "100", "9.50"),
+        ("0.005", "0.005", "0.01"),
         ("5.321", "-3.617", "1.70"),
         ("3.t", "-3.617", "error"),
         ("7", 1, "error"),
@@ -139,3 +180,46 @@ def test_sum_str(s1, s2, expected_result):
             sum_str(s1, s2)
     else:
         assert sum_str(s1, s2) == expected_result
+
+
+def test_to_decimal_round_money():
+    summa = to_decimal("5.321") + to_decimal("-3.617")
+    assert summa == Decimal("1.704")
+    assert round_money(summa) == "1.70"
+    assert round_money(Decimal("0.005")) == "0.00"
+    with pytest.raises(ValueError):
+        to_decimal("3.t")
+
+
+@pytest.mark.parametrize(
+    "s, kopecks",
+    [
+        ("7", 700),
+        ("100.00", 10000),
+        ("-90.5", -9050),
+        ("-0.05", -5),
+        ("+1.10", 110),
+        ("5.325", 532),
+        ("1E+2", 10000),
+        ("3.t", "error"),
+        ("--1", "error"),
+        ("", "error"),
+    ],
+)
+def test_to_kopecks(s, kopecks):
+    if kopecks == "error":
+        with pytest.raises(ValueError):
+            to_kopecks(s)
+    else:
+        assert to_kopecks(s) == kopecks
+        assert kopecks_to_str(kopecks) == round_money(to_decimal(s))
+
+
+@pytest.mark.parametrize(
+    "kopecks, s",
+    [(0, "10834.56"), (101, "-1.01"), (1, "0.005"), (0, "0.005"), (-5, "1E+1")],
+)
+def test_add_kopecks(kopecks, s):
+    assert kopecks_to_str(add_kopecks(kopecks, s)) == sum_str(
+        kopecks_to_str(kopecks), s
+    )
@@ -1,5 +1,6 @@
 import pytest
 import logging
+from dataclasses import replace
 
 from SRC.uchrabvr import Uchrabvr, UchrabvrStructure
 from SRC.common import (
@@ -61,10 +62,10 @@ def test_validate_detecates_on_broken_mapping(uchrabvr_obj):
 def test_more_than_one_primary_vidop(monkeypatch, caplog, uchrabvr_obj: Uchrabvr):
     uchrabvr_obj.buffer = [
         # две основные (18 и 48 в одной группе primary для 305)
-        uchrabvr_structure._replace(nrec="10", vidop="18"),
-        uchrabvr_structure._replace(nrec="12", vidop="48"),
+        replace(uchrabvr_structure, nrec="10", vidop="18"),
+        replace(uchrabvr_structure, nrec="12", vidop="48"),
         # одна вторичная, которая должна маппиться на ту же группу
-        uchrabvr_structure._replace(nrec="13", vidop="305"),
+        replace(uchrabvr_structure, nrec="13", vidop="305"),
     ]
 
     caplog.clear()
@@ -78,10 +79,10 @@ def test_more_than_one_primary_vidop(monkeypatch, caplog, uchrabvr_obj: Uchrabvr
 def test_absent_primary_vidop(monkeypatch, caplog, uchrabvr_obj: Uchrabvr):
     uchrabvr_obj.buffer = [
         # В основных нет ВО = 20
-        uchrabvr_structure._replace(nrec="10", vidop="18"),
+        replace(uchrabvr_structure, nrec="10", vidop="18"),
         # вторичные ВО 315 и 316 связаны с оновном ВО - 20
-        uchrabvr_structure._replace(nrec="12", vidop="315"),
-        uchrabvr_structure._replace(nrec="13", vidop="316"),
+        replace(uchrabvr_structure, nrec="12", vidop="315"),
+        replace(uchrabvr_structure, nrec="13", vidop="316"),
     ]
 
     caplog.clear()
@@ -94,10 +95,10 @@ def test_absent_primary_vidop(monkeypatch, caplog, uchrabvr_obj: Uchrabvr):
 
 def test_bad_sum(monkeypatch, caplog, uchrabvr_obj: Uchrabvr):
     uchrabvr_obj.buffer = [
-        uchrabvr_structure._replace(nrec="10", vidop="20"),
+        replace(uchrabvr_structure, nrec="10", vidop="20"),
         # Сумма не число сплавающей запятой
-        uchrabvr_structure._replace(nrec="12", vidop="315", summaval="3t14"),
-        uchrabvr_structure._replace(nrec="13", vidop="316"),
+        replace(uchrabvr_structure, nrec="12", vidop="315", summaval="3t14"),
+        replace(uchrabvr_structure, nrec="13", vidop="316"),
     ]
 
     caplog.clear()
@@ -109,10 +110,10 @@ def test_bad_sum(monkeypatch, caplog, uchrabvr_obj: Uchrabvr):
 
 def test_unprocessed_payment_types(monkeypatch, caplog, uchrabvr_obj: Uchrabvr):
     uchrabvr_obj.buffer = [
-        uchrabvr_structure._replace(nrec="10", vidop="20"),
+        replace(uchrabvr_structure, nrec="10", vidop="20"),
         # Сумма не число сплавающей запятой
-        uchrabvr_structure._replace(nrec="12", vidop="313", summaval="314"),
-        uchrabvr_structure._replace(nrec="13", vidop="314"),
+        replace(uchrabvr_structure, nrec="12", vidop="313", summaval="314"),
+        replace(uchrabvr_structure, nrec="13", vidop="314"),
     ]
 
     caplog.clear()
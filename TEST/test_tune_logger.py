@@ -1,7 +1,10 @@
 import pytest
 import logging
+import sys
 
-from SRC.tune_logger import TuneLogger
+from SRC.tune_logger import TuneLogger, LogBufferHandler, BufferedFileHandler
+from SRC.filterhandler import FilteringHandler
+from SRC.accumulatevidops import AccumulateVidops
 from SRC.uchrabvr import Uchrabvr, REQUIRED_PARAMETERS
 from SRC.parameters import RequiredParameter
 
@@ -48,3 +51,111 @@ def test_to_int_if_digit(param, result):
         result = None
 
     assert TuneLogger._to_int_if_digit(param) == result
+
+
+def _record(msg: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.makeLogRecord(
+        {"msg": msg, "levelno": level, "levelname": logging.getLevelName(level)}
+    )
+
+
+def _buffered_file(tmp_path):
+    path = tmp_path / "buffered.log"
+    target = BufferedFileHandler(path, mode="w", encoding="utf-8", delay=True)
+    target.setFormatter(logging.Formatter("%(message)s"))
+    return path, TuneLogger.create_buffered_handler(target)
+
+
+def test_buffer_written_on_critical(tmp_path):
+    path, buffered = _buffered_file(tmp_path)
+    buffered.handle(_record("первая"))
+    assert not path.exists() or path.read_text(encoding="utf-8") == ""
+
+    buffered.handle(_record("авария", logging.CRITICAL))
+    assert path.read_text(encoding="utf-8") == "первая\nавария\n"
+    buffered.close()
+
+
+def test_buffer_written_on_remove_logging(tmp_path, monkeypatch):
+    path, buffered = _buffered_file(tmp_path)
+    monkeypatch.setattr(logging.getLogger(), "handlers", [buffered])
+    buffered.handle(_record("первая"))
+    assert not path.exists() or path.read_text(encoding="utf-8") == ""
+
+    TuneLogger._remove_logging()
+    assert logging.getLogger().handlers == []
+    assert path.read_text(encoding="utf-8") == "первая\n"
+    buffered.close()
+
+
+@pytest.mark.parametrize("finish", ["flush", "close"])
+def test_buffered_file_handler_writes_on_flush_or_close(tmp_path, finish):
+    path = tmp_path / "file.log"
+    handler = BufferedFileHandler(path, mode="w", encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.emit(_record("строка"))
+    # emit() не сбрасывает поток: строка пока в буфере файла
+    assert path.read_text(encoding="utf-8") == ""
+
+    getattr(handler, finish)()
+    assert path.read_text(encoding="utf-8") == "строка\n"
+    handler.close()
+
+
+class _FailingTarget(logging.Handler):
+    """Цель, которая принимает записи, пока не включён режим отказа."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.fail = True
+        self.received: list[str] = []
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if self.fail:
+            raise PermissionError("нет доступа")
+        self.received.append(record.getMessage())
+        return True
+
+    def flush(self) -> None:
+        if self.fail:
+            raise PermissionError("нет доступа")
+
+
+def test_buffer_cleared_after_failed_flush():
+    target = _FailingTarget()
+    buffered = LogBufferHandler(capacity=10, target=target)
+    buffered.handle(_record("первая"))
+    with pytest.raises(PermissionError):
+        buffered.flush()
+
+    # Записи неудачного сброса не передаются повторно
+    target.fail = False
+    buffered.handle(_record("вторая"))
+    buffered.flush()
+    assert target.received == ["вторая"]
+
+
+def test_filtering_handler_flush_reports_access_error(capsys):
+    handler = FilteringHandler(_FailingTarget(), service_text="")
+    handler.flush()
+    err = capsys.readouterr().err
+    assert "Ошибка доступа к файлу журнала логирования" in err
+    assert "нет доступа" in err
+
+
+def test_lock_free_handle_rejected_by_filter():
+    handler = AccumulateVidops(service_text="VIDOP:")
+    handler.addFilter(lambda record: False)
+    assert not handler.handle(_record("VIDOP:18"))
+    assert handler.accumulate == set()
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 12), reason="фильтр возвращает запись начиная с 3.12"
+)
+def test_lock_free_handle_uses_filter_replacement():
+    handler = AccumulateVidops(service_text="VIDOP:")
+    replacement = _record("VIDOP:20")
+    handler.addFilter(lambda record: replacement)
+    assert handler.handle(_record("VIDOP:18")) is replacement
+    assert handler.accumulate == {"20"}
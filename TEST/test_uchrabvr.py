@@ -1,14 +1,9 @@
-import sys
 import runpy
 import builtins
+import logging
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # -> C:\2_otpusk
-
-import logging
 import pytest
-import builtins, runpy
-from pathlib import Path
 
 import SRC.uchrabvr as mod
 from SRC.uchrabvr import (
@@ -60,9 +55,10 @@ def test_validate_detects_duplicates_on_broken_mapping(uchrabvr_obj):
     ), "Дубликаты должны возвращаться без повторов"
 
 
-def _rows_for_update():
-    datan, datok = "2025-01-01", "2025-01-31"
-    primary = UchrabvrStructure(
+_DATAN, _DATOK = "2025-01-01", "2025-01-31"
+# Строки не изменяются обрабатывающим кодом, поэтому создаются один раз на модуль
+_ROWS_FOR_UPDATE = (
+    UchrabvrStructure(
         nrec="10",
         tabn="001",
         mes="01",
@@ -70,11 +66,11 @@ def _rows_for_update():
         vidop="18",
         summa="0.00",
         summaval="0.00",
-        datan=datan,
-        datok=datok,
+        datan=_DATAN,
+        datok=_DATOK,
         clsch="A",
-    )
-    secondary = UchrabvrStructure(
+    ),
+    UchrabvrStructure(
         nrec="11",
         tabn="001",
         mes="01",
@@ -82,11 +78,11 @@ def _rows_for_update():
         vidop="305",
         summa="0.00",
         summaval="100.00",
-        datan=datan,
-        datok=datok,
+        datan=_DATAN,
+        datok=_DATOK,
         clsch="A",
-    )
-    other = UchrabvrStructure(
+    ),
+    UchrabvrStructure(
         nrec="20",
         tabn="002",
         mes="01",
@@ -94,11 +90,11 @@ def _rows_for_update():
         vidop="999",
         summa="0.00",
         summaval="0.00",
-        datan=datan,
-        datok=datok,
+        datan=_DATAN,
+        datok=_DATOK,
         clsch="B",
-    )
-    return [primary, secondary, other]
+    ),
+)
 
 
 def test_processing_updates_primary_and_generates_sql(
@@ -107,7 +103,7 @@ def test_processing_updates_primary_and_generates_sql(
     def _fake_input_table(file_table, Table):
         return (r for r in rows)
 
-    rows = _rows_for_update()
+    rows = list(_ROWS_FOR_UPDATE)
     monkeypatch.setattr(common, "input_table", _fake_input_table)
 
     with caplog.at_level(logging.DEBUG):
@@ -237,3 +233,82 @@ def test_cli_write_error_exits_1(monkeypatch, tmp_path, exc):
     with pytest.raises(SystemExit) as se:
         runpy.run_module("SRC.uchrabvr", run_name="__main__")
     assert se.value.code == 1
+
+
+def test_cli_failed_processing_leaves_no_output(monkeypatch, tmp_path):
+    from SRC.uchrabvr_cli import run_once
+
+    def failing_start(self):
+        self.write_SQL("UPDATE uchrabvr WHERE nrec=1 SET summa:=1.00;")
+        raise ValueError
+
+    monkeypatch.setattr(mod.Uchrabvr, "start", failing_start)
+
+    real_init = mod.Uchrabvr.__init__
+
+    def fake_init(self):
+        real_init(self)
+        self.parameters_dict["output_file_path"] = str(tmp_path / "r.sql")
+
+    monkeypatch.setattr(mod.Uchrabvr, "__init__", fake_init)
+
+    assert run_once() == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cli_unexpected_error_leaves_no_output(monkeypatch, tmp_path):
+    from SRC.uchrabvr_cli import run_once
+
+    def failing_start(self):
+        self.write_SQL("UPDATE uchrabvr WHERE nrec=1 SET summa:=1.00;")
+        raise TypeError  # как Table(*row) на строке с неверным числом полей
+
+    monkeypatch.setattr(mod.Uchrabvr, "start", failing_start)
+
+    real_init = mod.Uchrabvr.__init__
+
+    def fake_init(self):
+        real_init(self)
+        self.parameters_dict["output_file_path"] = str(tmp_path / "r.sql")
+
+    monkeypatch.setattr(mod.Uchrabvr, "__init__", fake_init)
+
+    with pytest.raises(TypeError):
+        run_once()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unsorted_input_is_reported(monkeypatch, caplog, uchrabvr_obj):
+    rows = list(_ROWS_FOR_UPDATE)
+    # Строки сотрудника "A" разнесены по файлу
+    rows = [rows[0], rows[2], rows[1]]
+    monkeypatch.setattr(common, "input_table", lambda *a, **k: (r for r in rows))
+
+    with caplog.at_level(logging.ERROR):
+        uchrabvr_obj.start()
+
+    assert uchrabvr_obj.return_code == 1
+    assert "не упорядочен по CLSCH" in caplog.text
+
+
+_service_warning = Uchrabvr.service_warning  # до подмены в фикстуре uchrabvr_obj
+
+
+@pytest.mark.parametrize(
+    "env, cfg, expected",
+    [
+        ("1", "no", True),
+        ("", "да", True),
+        ("", "no", False),
+    ],
+)
+def test_unattended_skips_pause(monkeypatch, uchrabvr_obj, env, cfg, expected):
+    monkeypatch.setenv(mod.UNATTENDED_ENV, env)
+    uchrabvr_obj.parameters_dict["unattended"] = cfg
+    calls = []
+    monkeypatch.setattr(builtins, "input", lambda *a: calls.append(a))
+
+    _service_warning(uchrabvr_obj)
+
+    assert uchrabvr_obj.is_unattended() is expected
+    assert bool(calls) is not expected
@@ -1,9 +1,3 @@
-import sys, pathlib
-
-sys.path.insert(
-    0, str(pathlib.Path(__file__).resolve().parent.parent)
-)  # -> C:\2_otpusk
-
 import logging
 import pytest
 
@@ -80,9 +74,9 @@ def test_grouping_and_info_logged(monkeypatch, caplog, uder_obj):
     assert any("Разница сумм налогов" in m and "; 10.00" in m for m in messages)
 
 
-def test_filter_sort_by_group(uder_obj):
+def test_sum_by_group(uder_obj):
     clsch = "E"
-    uder_obj.person_uders = [
+    person_uders = [
         UderStructure(
             nrec="1",
             tabn="T",
@@ -115,5 +109,28 @@ def test_filter_sort_by_group(uder_obj):
         ),
     ]
     uder_obj._normalize_data()
-    filtered = uder_obj.filter_sort_by_group()
-    assert [f.group_vidud for f in filtered] == ["04", "06"]
+    group_sums, group_tabns = uder_obj.sum_by_group(person_uders)
+    assert sorted(group_sums) == ["04", "06"]
+    assert group_sums == {"04": 200, "06": 100}
+    assert group_tabns == {"04": "T", "06": "T"}
+
+
+def test_sum_by_group_rounds_running_total(uder_obj):
+    """Итог группы округляется после каждого сложения, как при sum_str: 0.01 + 0.005 → 0.02."""
+    person_uders = [
+        UderStructure(
+            nrec=str(i),
+            tabn="T",
+            mes="6",
+            vidud="13",
+            sumud=sumud,
+            clsch="E",
+            datav="",
+            vidoplud="",
+        )
+        for i, sumud in enumerate(("0.01", "0.005"))
+    ]
+    uder_obj._normalize_data()
+    group_sums, _ = uder_obj.sum_by_group(person_uders)
+    assert group_sums == {"06": common.to_kopecks(common.sum_str("0.01", "0.005"))}
+    assert group_sums == {"06": 2}
@@ -1,6 +1,7 @@
 import re
 import shutil
 import logging
+from functools import lru_cache
 from pathlib import Path
 
 # ===== Импорты тестируемого кода =====
@@ -10,7 +11,7 @@ from SRC.uchrabvr_cli import run_once
 # ===== Утилиты сравнения =====
 _TS = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:,\d{3})?")
 _PID = re.compile(r"\(pid=\d+\)")
-_SPACES = re.compile(r"[ \t]+$")  # хвостовые пробелы
+_SPACES = re.compile(r"[ \t]+$", re.MULTILINE)  # хвостовые пробелы в каждой строке
 
 
 def _read_text(path: Path, enc: str, fallback: str | None = None) -> str:
@@ -28,17 +29,23 @@ def _normalize_log(s: str, roots: list[Path]) -> str:
     # 2) убираем timestamp и PID (если пишутся)
     s = _TS.sub("<TS>", s)
     s = _PID.sub("(pid=<PID>)", s)
-    # 3) нормализуем абсолютные пути (tmp/каталог) → <ROOT>
-    for root in sorted(roots, key=lambda p: len(str(p)), reverse=True):
-        s = s.replace(str(root), "<ROOT>")
+    # 3) нормализуем абсолютные пути (tmp/каталог) → <ROOT> за один проход
+    s = _roots_pattern(tuple(str(root) for root in roots)).sub("<ROOT>", s)
     # 4) чистим хвостовые пробелы
-    s = "\n".join(_SPACES.sub("", line) for line in s.split("\n"))
+    s = _SPACES.sub("", s)
     return s.strip() + "\n"
 
 
+@lru_cache(maxsize=None)
+def _roots_pattern(roots: tuple[str, ...]) -> re.Pattern[str]:
+    """Одно регулярное выражение для всех корней; длинные пути проверяются первыми."""
+    ordered = sorted(roots, key=len, reverse=True)
+    return re.compile("|".join(re.escape(root) for root in ordered))
+
+
 def _normalize_lot(s: str) -> str:
     s = s.replace("\r\n", "\n").replace("\r", "\n")
-    s = "\n".join(_SPACES.sub("", line) for line in s.split("\n"))
+    s = _SPACES.sub("", s)
     return s.strip() + "\n"
 
 